@@ -1,21 +1,22 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import logging
-import numpy as np
 from models.schemas import AsignacionRequest
 from core.algoritmo_genetico import AlgoritmoGeneticoCoderush
-from core.visualizaciones import procesar_datos_algoritmo, crear_visualizador
+from core.visualizaciones import procesar_datos_algoritmo, crear_visualizador, CAMPOS_PUNTO_GRAFICA
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 cache_metricas = {}
+# Respuestas de gráfica ya generadas por solución (se reemplaza junto con cache_metricas)
+cache_graficas = {}
 
 @router.post("/optimizar")
 async def optimizar_asignaciones(request: AsignacionRequest):
     try:
-        global cache_metricas
-        cache_metricas.clear() 
+        global cache_metricas, cache_graficas
         
         config = request.configuracion
         participantes_originales = request.participantes
@@ -43,79 +44,63 @@ async def optimizar_asignaciones(request: AsignacionRequest):
         # ALGORITMO GENÉTICO PURO
         logger.info(f"Configurando algoritmo con {len(equipo_seleccionado)} participantes")
         
-        algoritmo = AlgoritmoGeneticoCoderush(
-            problemas=problemas_originales,
-            participantes=equipo_seleccionado,
-            configuracion_competencia=config
-        )
+        try:
+            algoritmo = AlgoritmoGeneticoCoderush(
+                problemas=problemas_originales,
+                participantes=equipo_seleccionado,
+                configuracion_competencia=config
+            )
+        except ValueError as e:
+            # Datos de entrada inválidos detectados en la validación inicial
+            raise HTTPException(status_code=400, detail=str(e))
         
-        resultado = algoritmo.iniciar_optimizacion()
+        # El algoritmo es CPU intensivo: se ejecuta en el pool de hilos para no bloquear el event loop
+        resultado = await run_in_threadpool(algoritmo.iniciar_optimizacion)
         
         if not resultado.get('exito'):
             error_msg = resultado.get('mensaje', 'No se pudo generar una solución válida.')
             raise HTTPException(status_code=500, detail=error_msg)
 
+        # Cada solución ya trae sus 'estadisticas' calculadas en el algoritmo a partir de sus arreglos
         mejores_soluciones = resultado['mejores_soluciones']
-
-        # Calcular estadísticas para cada solución
-        for solucion_key, solucion in mejores_soluciones.items():
-            asignaciones = solucion.get('asignaciones_detalle', [])
-            if asignaciones:
-                puntuacion = sum(float(a['puntuacion_esperada']) for a in asignaciones)
-                
-                # Calcular tiempo en paralelo, no secuencial
-                tiempo_por_participante = {}
-                for asig in asignaciones:
-                    participante = asig['participante_nombre']
-                    if participante not in tiempo_por_participante:
-                        tiempo_por_participante[participante] = 0
-                    tiempo_por_participante[participante] += float(asig['tiempo_estimado'])
-                
-                # Tiempo total = máximo tiempo de cualquier participante (trabajo en paralelo)
-                tiempo_total_paralelo = max(tiempo_por_participante.values()) if tiempo_por_participante else 0
-                
-                compatibilidades = [a['compatibilidad'] for a in asignaciones]
-                compatibilidad_prom = np.mean(compatibilidades) * 100
-                
-                estadisticas = {
-                    'puntuacion_total_esperada': round(puntuacion, 2),
-                    'tiempo_total_estimado': int(tiempo_total_paralelo),
-                    'compatibilidad_promedio': round(compatibilidad_prom, 1),
-                    'participantes_utilizados': len(set(a['participante_nombre'] for a in asignaciones))
-                }
-                solucion['estadisticas'] = estadisticas
+        historial = resultado.get('historial', [])
+        estadisticas_finales = resultado.get('estadisticas_finales', {})
 
         # ✅ NUEVO: Procesar datos para visualizaciones
-        # Obtener población final para análisis adicional
-        try:
-            # Intentar obtener población final del algoritmo si está disponible
-            poblacion_final = getattr(algoritmo, '_poblacion_final', [])
-        except:
-            poblacion_final = []
+        # Población final para análisis adicional (el algoritmo siempre inicializa el atributo)
+        poblacion_final = algoritmo._poblacion_final
 
         # Procesar datos de visualización una sola vez
         datos_visualizacion = procesar_datos_algoritmo(
-            historial_basico=resultado.get('historial', []),
+            historial_basico=historial,
             poblacion_final=poblacion_final
         )
 
+        # Parámetros del algoritmo: iguales para las 3 soluciones, se construyen una vez
+        parametros = {
+            'poblacion': algoritmo.poblacion_size,
+            'generaciones': algoritmo.generaciones_max,
+            'tasa_cruce': algoritmo.prob_cruce,
+            'tasa_mutacion': algoritmo.prob_mutacion,
+            'elitismo': algoritmo.elite_size
+        }
+
         # CORRECCIÓN: Guardar métricas para CADA una de las 3 soluciones
+        nuevas_metricas = {}
         for i, (solucion_key, solucion) in enumerate(mejores_soluciones.items(), 1):
-            cache_metricas[i] = {
-                'historial_fitness': resultado.get('historial', []),
-                'estadisticas_finales': resultado.get('estadisticas_finales', {}),
+            nuevas_metricas[i] = {
+                'historial_fitness': historial,
+                'estadisticas_finales': estadisticas_finales,
                 'mejores_soluciones': {solucion_key: solucion},
-                'parametros': {
-                    'poblacion': algoritmo.poblacion_size,
-                    'generaciones': algoritmo.generaciones_max,
-                    'tasa_cruce': algoritmo.prob_cruce,
-                    'tasa_mutacion': algoritmo.prob_mutacion,
-                    'elitismo': algoritmo.elite_size
-                },
+                'parametros': parametros,
                 # ✅ NUEVO: Agregar datos de visualización procesados
                 'datos_visualizacion': datos_visualizacion
             }
 
+        # Ambas cachés se reemplazan juntas al terminar la corrida (sin await entre ellas): durante
+        # una optimización se sigue sirviendo el resultado anterior y nunca se mezclan corridas
+        cache_metricas, cache_graficas = nuevas_metricas, {}
+
         logger.info(f"Optimización completada exitosamente. {len(mejores_soluciones)} soluciones generadas.")
         logger.info(f"Métricas guardadas para soluciones: {list(cache_metricas.keys())}")
 
@@ -123,8 +108,8 @@ async def optimizar_asignaciones(request: AsignacionRequest):
             'success': True,
             'mensaje': f'Optimización completada. {len(mejores_soluciones)} mejores estrategias encontradas.',
             'top_3_soluciones': mejores_soluciones,
-            'historial': resultado.get('historial', []),
-            'estadisticas_finales': resultado.get('estadisticas_finales', {}),
+            'historial': historial,
+            'estadisticas_finales': estadisticas_finales,
         })
         
     except HTTPException as http_exc:
@@ -172,6 +157,10 @@ async def obtener_datos_grafica(solucion_id: int):
             detail=f"Datos de gráfica no encontrados para solución {solucion_id}. Ejecuta primero la optimización."
         )
     
+    # Recargas de la misma gráfica no repiten extrapolación ni estadísticas
+    if solucion_id in cache_graficas:
+        return JSONResponse(content=cache_graficas[solucion_id])
+    
     try:
         # Obtener datos de visualización procesados
         datos_cache = cache_metricas[solucion_id]
@@ -193,10 +182,9 @@ async def obtener_datos_grafica(solucion_id: int):
         
         if datos_grafica:
             # Generar datos para Chart.js compatible con tu componente
-            generaciones = [d['generacion'] for d in datos_grafica]
-            fitness_mejor = [d['mejor_fitness'] for d in datos_grafica]
-            fitness_promedio = [d['fitness_promedio'] for d in datos_grafica]
-            fitness_peor = [d.get('peor_fitness', d['fitness_promedio'] * 0.7) for d in datos_grafica]
+            generaciones, fitness_mejor, fitness_promedio, fitness_peor = map(
+                list, zip(*map(CAMPOS_PUNTO_GRAFICA, datos_grafica))
+            )
             
             # ✅ DATOS EXACTOS PARA TU COMPONENTE MetricsPanel
             datos_para_frontend = {
@@ -245,19 +233,21 @@ async def obtener_datos_grafica(solucion_id: int):
                 'datasets': []
             }
         
-        return JSONResponse(content={
+        cache_graficas[solucion_id] = {
             "success": True,
             "solucion_id": solucion_id,
             "datos_grafica": datos_para_frontend,  # ✅ EXACTO PARA TU Chart.js
             "chartjs_completo": datos_chartjs,     # Datos completos con opciones
             "resumen_metricas": resumen_metricas,  # Métricas adicionales
             "estadisticas": {
-                "total_generaciones": len(datos_grafica),
-                "fitness_maximo": max(fitness_mejor) if fitness_mejor else 0,
+                "total_generaciones": datos_visualizacion.get('metadatos', {}).get('total_generaciones', len(datos_grafica)),
+                # De la serie completa: datos_grafica puede estar submuestreada y omitir el pico
+                "fitness_maximo": datos_visualizacion.get('estadisticas', {}).get('fitness_maximo', 0),
                 "fitness_final": fitness_mejor[-1] if fitness_mejor else 0,
                 "mejora_porcentual": resumen_metricas.get('rendimiento', {}).get('mejora_porcentual', 0)
             }
-        })
+        }
+        return JSONResponse(content=cache_graficas[solucion_id])
         
     except Exception as e:
         logger.error(f"Error generando datos de gráfica para solución {solucion_id}: {e}", exc_info=True)
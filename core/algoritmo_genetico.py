@@ -1,17 +1,51 @@
 import numpy as np
-import random
+import hashlib
 import logging
-from typing import Dict, List
-from copy import deepcopy
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Campos numéricos que la evaluación usa directamente en su ruta crítica
+CAMPOS_NUMERICOS_PARTICIPANTE = (
+    'nivel_habilidad', 'tasa_exito_historica', 'experiencia_anos',
+    'competencias_participadas', 'problemas_resueltos_total'
+)
+CAMPOS_NUMERICOS_PROBLEMA = ('puntos_base', 'multiplicador_dificultad', 'tiempo_limite')
+CAMPOS_NUMERICOS_PROBLEMA_OPCIONALES = ('tasa_resolucion_historica',)
+
+# Métricas de un individuo aún no evaluado; compartidas porque nunca se modifican in situ
+_METRICAS_VACIAS: Dict = {}
+
+# Operadores de mutación, elegidos con probabilidad uniforme
+TIPOS_MUTACION = ('intercambio', 'reasignacion', 'agregar', 'quitar')
+
 class IndividuoGenetico:
+    # Sin __dict__ por instancia: se crean cientos de individuos por generación
+    __slots__ = ('cromosoma', 'fitness', 'es_valido', 'metricas_detalladas', '_huella')
+
     def __init__(self, cromosoma: np.ndarray):
         self.cromosoma = cromosoma
         self.fitness = 0.0
         self.es_valido = False
-        self.metricas_detalladas = {}
+        self.metricas_detalladas = _METRICAS_VACIAS
+        self._huella: Optional[int] = None
+
+    def huella(self) -> int:
+        """Digest de 64 bits del cromosoma, calculado una vez (se invalida al mutar)"""
+        if self._huella is None:
+            # blake2b lee el buffer directamente, sin copia a bytes
+            datos = memoryview(np.ascontiguousarray(self.cromosoma)).cast('B')
+            self._huella = int.from_bytes(hashlib.blake2b(datos, digest_size=8).digest(), 'little')
+        return self._huella
+
+    def clone(self) -> 'IndividuoGenetico':
+        """Copia barata: solo se duplica el cromosoma; las métricas se reemplazan, nunca se modifican"""
+        copia = IndividuoGenetico(self.cromosoma.copy())
+        copia.fitness = self.fitness
+        copia.es_valido = self.es_valido
+        copia.metricas_detalladas = self.metricas_detalladas
+        copia._huella = self._huella
+        return copia
 
 class EvaluadorFitness:
     def __init__(self):
@@ -22,18 +56,64 @@ class EvaluadorFitness:
             'cantidad_problemas': 0.2,
             'tiempo_total': 0.1
         }
-        
+
+        # Datos invariantes durante una ejecución (se calculan una sola vez)
+        self._problemas = None
+        self._participantes = None
+        self._habilidades_req: List[Dict[str, float]] = []
+        self._pesos_dinamicos = None
+        self._vector_pesos = None
+
+        self._puntuacion_maxima_vec = None
+        self._puntuacion_maxima_teorica = 0.0
+        self._matriz_compatibilidad = None
+        self._matriz_probabilidad = None
+        self._matriz_tiempo = None
+        self._matriz_puntuacion = None
+
         logger.info("Evaluador inicializado con pesos adaptativos")
 
+    def _preparar_datos(self, problemas, participantes):
+        """Precalcula los valores por problema que no cambian entre evaluaciones"""
+        if problemas is self._problemas and participantes is self._participantes:
+            return
+
+        # Las habilidades requeridas se parsean una vez por problema, no por evaluación
+        # Alineadas con el índice de problema (fila de las matrices)
+        self._habilidades_req = [
+            self._parsear_habilidades_requeridas(p['habilidades_requeridas'])
+            for p in problemas
+        ]
+        self._pesos_dinamicos = self._calcular_pesos_dinamicos(problemas, participantes)
+        # Mismo orden que los objetivos apilados en evaluar_poblacion
+        self._vector_pesos = np.array([self._pesos_dinamicos[clave] for clave in self.pesos_base], dtype=np.float64)
+        self._puntuacion_maxima_vec = np.array(
+            [p['puntos_base'] * p['multiplicador_dificultad'] for p in problemas],
+            dtype=np.float64
+        )
+        self._puntuacion_maxima_teorica = float(self._puntuacion_maxima_vec.sum())
+        self._matriz_compatibilidad = self._calcular_matriz_compatibilidad(problemas, participantes)
+
+        # Probabilidad, tiempo y puntuación esperada por celda (problema, participante)
+        self._matriz_probabilidad, self._matriz_tiempo = self._calcular_matrices_probabilidad_tiempo(
+            problemas, participantes, self._matriz_compatibilidad
+        )
+        self._matriz_puntuacion = self._puntuacion_maxima_vec[:, None] * self._matriz_probabilidad
+
+        # Referencias de los datos preparados, para el atajo por identidad al inicio
+        self._problemas = problemas
+        self._participantes = participantes
+
     def _calcular_pesos_dinamicos(self, problemas, participantes):
         """Calcula pesos dinámicamente según las características de los datos"""
-        # Análisis de diversidad de dificultades
-        dificultades = [p.get('nivel_dificultad', 'medio') for p in problemas]
-        diversidad_dificultad = len(set(dificultades)) / len(dificultades) if dificultades else 0.5
+        # Análisis de diversidad de dificultades (texto normalizado: 'Medio' y ' medio' cuentan como una)
+        dificultades = {str(p.get('nivel_dificultad', 'medio')).lower().strip() for p in problemas}
+        diversidad_dificultad = len(dificultades) / len(problemas) if problemas else 0.5
         
         # Análisis de dispersión de habilidades
-        experiencias = [p.get('experiencia_anos', 2) for p in participantes]
-        dispersión_experiencia = np.std(experiencias) / np.mean(experiencias) if experiencias else 0.5
+        experiencias = np.fromiter((p.get('experiencia_anos', 2) for p in participantes),
+                                   dtype=np.float64, count=len(participantes))
+        dispersión_experiencia = experiencias.std() / experiencias.mean() if experiencias.size else 0.5
         
         # Ajustar pesos dinámicamente
         factor_complejidad = (diversidad_dificultad + dispersión_experiencia) / 2
@@ -60,260 +140,207 @@ class EvaluadorFitness:
             habilidades['algoritmos_basicos'] = 0.5
         return habilidades
 
-    def _calcular_compatibilidad_pura(self, participante: Dict, problema: Dict) -> float:
-        """Compatibilidad pura basada solo en datos reales, sin factores artificiales"""
-        habilidades_req = self._parsear_habilidades_requeridas(problema['habilidades_requeridas'])
-        
-        # Solo datos reales del CSV
-        habilidad_principal = participante['habilidad_principal']
-        nivel_habilidad = participante['nivel_habilidad']
-        tasa_exito_historica = participante['tasa_exito_historica']
-        
-        # Compatibilidad directa de habilidades
-        compatibilidad_habilidad = 0.0
-        if habilidad_principal in habilidades_req:
-            compatibilidad_habilidad = nivel_habilidad * habilidades_req[habilidad_principal]
-        elif habilidad_principal == problema['tipo']:
-            compatibilidad_habilidad = nivel_habilidad * 0.9
-        else:
-            # Compatibilidad cruzada basada en experiencia general
-            compatibilidad_habilidad = nivel_habilidad * 0.6
-        
-        # Factor de experiencia histórica real
-        factor_experiencia = tasa_exito_historica
-        
-        # ✅ COMBINACIÓN PURA: Solo promedio ponderado, sin artificios
-        compatibilidad = (
-            0.7 * compatibilidad_habilidad +
-            0.3 * factor_experiencia
+    def _calcular_matriz_compatibilidad(self, problemas, participantes) -> np.ndarray:
+        """Compatibilidad (problemas × participantes) calculada en bloque con NumPy"""
+        habilidades_principales = [p['habilidad_principal'] for p in participantes]
+        vocabulario = {h: k for k, h in enumerate(dict.fromkeys(habilidades_principales))}
+        indice_habilidad = np.array([vocabulario[h] for h in habilidades_principales], dtype=np.intp)
+
+        # Nivel requerido por problema para cada habilidad principal (NaN si no la pide)
+        requeridos = np.full((len(problemas), len(vocabulario)), np.nan)
+        for i, habilidades_req in enumerate(self._habilidades_req):
+            for habilidad, nivel in habilidades_req.items():
+                if habilidad in vocabulario:
+                    requeridos[i, vocabulario[habilidad]] = nivel
+        requerido = requeridos[:, indice_habilidad]
+
+        nivel = np.array([p['nivel_habilidad'] for p in participantes], dtype=np.float64)
+        tasa_exito = np.array([p['tasa_exito_historica'] for p in participantes], dtype=np.float64)
+        mismo_tipo = (
+            np.array([p.get('tipo') for p in problemas], dtype=object)[:, None]
+            == np.array(habilidades_principales, dtype=object)[None, :]
         )
-        
-        return max(0.0, min(1.0, compatibilidad))
 
-    def _calcular_probabilidad_exito_real(self, participante: Dict, problema: Dict) -> float:
-        """Probabilidad basada únicamente en datos históricos reales"""
-        tasa_base = participante['tasa_exito_historica']
-        experiencia_anos = participante['experiencia_anos']
-        competencias = participante['competencias_participadas']
-        problemas_resueltos = participante['problemas_resueltos_total']
-        
-        # Factor de experiencia acumulada (datos reales)
-        experiencia_normalizada = min(1.0, experiencia_anos / 10.0)
-        competencias_normalizadas = min(1.0, competencias / 20.0)
-        problemas_normalizados = min(1.0, problemas_resueltos / 200.0)
-        
+        # Habilidad pedida por el problema: nivel × requerido; si no, 0.9 del nivel para el mismo tipo o 0.6 cruzada
+        compatibilidad_habilidad = np.where(
+            np.isnan(requerido),
+            np.where(mismo_tipo, nivel * 0.9, nivel * 0.6),
+            nivel * requerido
+        )
+        return np.clip(0.7 * compatibilidad_habilidad + 0.3 * tasa_exito, 0.0, 1.0)
+
+    def _calcular_matrices_probabilidad_tiempo(self, problemas, participantes, compatibilidad):
+        """Probabilidad de éxito y tiempo estimado (problemas × participantes) en bloque con NumPy"""
+        def columna(entidades, campo, por_defecto=None):
+            return np.array([e.get(campo, por_defecto) for e in entidades], dtype=np.float64)
+
+        tasa_base = columna(participantes, 'tasa_exito_historica')
+        experiencia_anos = columna(participantes, 'experiencia_anos')
+        competencias = columna(participantes, 'competencias_participadas')
+        problemas_resueltos = columna(participantes, 'problemas_resueltos_total')
+        tasa_problema_historica = columna(problemas, 'tasa_resolucion_historica', 0.5)[:, None]
+        tiempo_limite = columna(problemas, 'tiempo_limite')[:, None]
+
+        # Probabilidad: promedio ponderado de tasa histórica, experiencia acumulada, compatibilidad y
+        # tasa de resolución del problema, acotado a [0.1, 0.9]
         factor_experiencia_total = (
-            experiencia_normalizada + competencias_normalizadas + problemas_normalizados
+            np.minimum(1.0, experiencia_anos / 10.0) +
+            np.minimum(1.0, competencias / 20.0) +
+            np.minimum(1.0, problemas_resueltos / 200.0)
         ) / 3.0
-        
-        # Compatibilidad con el problema
-        compatibilidad = self._calcular_compatibilidad_pura(participante, problema)
-        
-        # Dificultad histórica del problema
-        tasa_problema_historica = problema.get('tasa_resolucion_historica', 0.5)
-        
-        # ✅ CÁLCULO PURO: Solo promedios ponderados de datos reales
-        probabilidad = (
-            0.4 * tasa_base +
-            0.3 * factor_experiencia_total +
-            0.2 * compatibilidad +
-            0.1 * tasa_problema_historica
+        probabilidad = np.clip(
+            0.4 * tasa_base + 0.3 * factor_experiencia_total + 0.2 * compatibilidad + 0.1 * tasa_problema_historica,
+            0.1, 0.9
         )
-        
-        return max(0.1, min(0.9, probabilidad))
 
-    def _estimar_tiempo_real(self, participante: Dict, problema: Dict) -> float:
-        """Estimación basada en datos reales sin factores artificiales"""
-        tiempo_limite_problema = problema['tiempo_limite']
-        
-        # Factores reales de velocidad
-        experiencia_anos = participante['experiencia_anos']
-        problemas_resueltos = participante['problemas_resueltos_total']
-        
-        # ✅ FACTORES PUROS: Basados en relaciones matemáticas simples
-        # Más experiencia = mayor velocidad (menos tiempo)
-        factor_experiencia = max(0.5, 1.0 - (experiencia_anos / 15.0))
-        factor_practica = max(0.5, 1.0 - (problemas_resueltos / 400.0))
-        
-        # Compatibilidad afecta velocidad de resolución
-        compatibilidad = self._calcular_compatibilidad_pura(participante, problema)
-        factor_dificultad_personal = max(0.6, 1.4 - compatibilidad)
-        
-        # ✅ TIEMPO ESTIMADO PURO
-        tiempo_estimado = tiempo_limite_problema * 0.7 * (
-            0.4 * factor_experiencia +
-            0.4 * factor_practica +
-            0.2 * factor_dificultad_personal
+        # Tiempo: fracción del límite según experiencia, práctica y compatibilidad, acotada a [0.2, 0.8] del límite
+        factor_experiencia = np.maximum(0.5, 1.0 - (experiencia_anos / 15.0))
+        factor_practica = np.maximum(0.5, 1.0 - (problemas_resueltos / 400.0))
+        factor_dificultad_personal = np.maximum(0.6, 1.4 - compatibilidad)
+        tiempo_estimado = tiempo_limite * 0.7 * (
+            0.4 * factor_experiencia + 0.4 * factor_practica + 0.2 * factor_dificultad_personal
         )
-        
-        # Límites realistas basados en el tiempo del problema
-        tiempo_minimo = tiempo_limite_problema * 0.2
-        tiempo_maximo = tiempo_limite_problema * 0.8
-        
-        return max(tiempo_minimo, min(tiempo_maximo, tiempo_estimado))
+        tiempo = np.clip(tiempo_estimado, tiempo_limite * 0.2, tiempo_limite * 0.8, out=tiempo_estimado)
 
-    def _calcular_puntuacion_esperada_pura(self, participante: Dict, problema: Dict) -> float:
-        """Puntuación esperada basada solo en probabilidad real de éxito"""
-        puntos_base = problema['puntos_base']
-        multiplicador = problema['multiplicador_dificultad']
-        
-        # ✅ PUNTUACIÓN PURA: Solo multiplicación directa
-        puntuacion_maxima = puntos_base * multiplicador
-        probabilidad_exito = self._calcular_probabilidad_exito_real(participante, problema)
-        
-        return puntuacion_maxima * probabilidad_exito
+        return probabilidad, tiempo
 
     def evaluar_individuo(self, individuo, problemas, participantes, config):
-        """Evaluación que considera trabajo en paralelo real"""
+        """Evaluación que considera trabajo en paralelo real (lote de un solo individuo)"""
         try:
-            # Calcular pesos dinámicos para esta evaluación
-            pesos_dinamicos = self._calcular_pesos_dinamicos(problemas, participantes)
-            
-            asignaciones = self._extraer_asignaciones_validas(individuo.cromosoma, problemas, participantes)
-            if not asignaciones:
-                individuo.fitness, individuo.es_valido = 0.0, False
-                return
+            self.evaluar_poblacion([individuo], problemas, participantes, config)
+        except Exception as e:
+            logger.error("Error en evaluación: %s", e, exc_info=True)
+            individuo.fitness, individuo.es_valido = 0.0, False
 
-            # ✅ CALCULAR POR PARTICIPANTE (trabajo en paralelo)
-            asignaciones_enriquecidas = []
-            asignaciones_por_participante = {}
-            
-            for asig in asignaciones:
-                participante = participantes[asig['participante_idx']]
-                problema = problemas[asig['problema_idx']]
-                
-                # Agrupar por participante
-                p_idx = asig['participante_idx']
-                if p_idx not in asignaciones_por_participante:
-                    asignaciones_por_participante[p_idx] = []
-                
-                asig_calculada = {
-                    **asig,
-                    'compatibilidad': self._calcular_compatibilidad_pura(participante, problema),
-                    'tiempo_estimado': self._estimar_tiempo_real(participante, problema),
-                    'probabilidad_exito': self._calcular_probabilidad_exito_real(participante, problema),
-                    'puntuacion_esperada': self._calcular_puntuacion_esperada_pura(participante, problema)
-                }
-                
-                asignaciones_enriquecidas.append(asig_calculada)
-                asignaciones_por_participante[p_idx].append(asig_calculada)
+    def evaluar_poblacion(self, individuos, problemas, participantes, config):
+        """Evalúa un lote de individuos a la vez apilando sus cromosomas en un tensor"""
+        if not individuos:
+            return
+        self._preparar_datos(problemas, participantes)
+        pesos_dinamicos = self._pesos_dinamicos
+        num_individuos = len(individuos)
+        num_participantes = len(participantes)
 
-            # ✅ VALIDAR QUE USE EL TAMAÑO DE EQUIPO CORRECTO
-            participantes_usados = len(asignaciones_por_participante)
-            participantes_esperados = min(config.tamanio_equipo, len(asignaciones))
-            
-            # Factor de utilización de equipo
-            if participantes_usados < participantes_esperados:
-                factor_utilizacion = participantes_usados / participantes_esperados
-            else:
-                factor_utilizacion = 1.0
+        # Tensor (individuos × problemas × participantes); un participante por problema,
+        # el de mayor puntuación esperada si hay varios (igual que _extraer_indices_validos)
+        mascara = np.stack([ind.cromosoma for ind in individuos]) > 0
+        fila_asignada = mascara.any(axis=2)
+        columna = np.where(mascara, self._matriz_puntuacion[None, :, :], -np.inf).argmax(axis=2)
+        ind_idx, problema_idx = np.nonzero(fila_asignada)
+        participante_idx = columna[ind_idx, problema_idx]
 
-            # ✅ CALCULAR TIEMPO EN PARALELO (NO SECUENCIAL)
-            tiempos_por_participante = {}
-            for p_idx, asigs_participante in asignaciones_por_participante.items():
-                tiempo_total_participante = sum(a['tiempo_estimado'] for a in asigs_participante)
-                tiempos_por_participante[p_idx] = tiempo_total_participante
-            
-            # ✅ TIEMPO TOTAL = MÁXIMO TIEMPO DE CUALQUIER PARTICIPANTE
-            tiempo_total_paralelo = max(tiempos_por_participante.values()) if tiempos_por_participante else 0
-
-            # ✅ VALIDACIÓN DE TIEMPO EN PARALELO
-            if tiempo_total_paralelo > config.tiempo_total_minutos:
-                individuo.fitness = 0.0
-                individuo.es_valido = False
-                return
-            
-            # ===================================================================
-            # ✅ OBJETIVOS PUROS PARA TRABAJO EN PARALELO
-            # ===================================================================
-            
-            # 1. Puntuación total esperada
-            puntuacion_total = sum(a['puntuacion_esperada'] for a in asignaciones_enriquecidas)
-            puntuacion_maxima_teorica = sum(p['puntos_base'] * p['multiplicador_dificultad'] for p in problemas)
-            obj_puntuacion = puntuacion_total / puntuacion_maxima_teorica if puntuacion_maxima_teorica > 0 else 0
-            
-            # 2. Fortalezas individuales
-            compatibilidades = [a['compatibilidad'] for a in asignaciones_enriquecidas]
-            obj_fortalezas = np.mean(compatibilidades) if compatibilidades else 0
-            
-            # 3. Cantidad de problemas esperados
-            problemas_esperados = sum(a['probabilidad_exito'] for a in asignaciones_enriquecidas)
-            obj_cantidad = problemas_esperados / len(problemas) if problemas else 0
-            
-            # 4. ✅ EFICIENCIA TEMPORAL EN PARALELO
-            eficiencia_temporal = max(0.0, 1.0 - (tiempo_total_paralelo / config.tiempo_total_minutos))
-            obj_tiempo = eficiencia_temporal
-            
-            # ✅ BONUS POR UTILIZACIÓN DE EQUIPO COMPLETO
-            bonus_equipo = factor_utilizacion * 0.1
-            
-            # ✅ BONUS POR BALANCE DE CARGA
-            if len(tiempos_por_participante) > 1:
-                tiempos = list(tiempos_por_participante.values())
-                cv_tiempos = np.std(tiempos) / np.mean(tiempos) if np.mean(tiempos) > 0 else 1.0
-                bonus_balance = max(0.0, (1.0 - cv_tiempos)) * 0.05
-            else:
-                bonus_balance = 0.0
-            
-            # ✅ FITNESS FINAL CON BONIFICACIONES POR TRABAJO EN EQUIPO
-            fitness_base = (
-                pesos_dinamicos['puntuacion'] * obj_puntuacion +
-                pesos_dinamicos['fortalezas_individuales'] * obj_fortalezas +
-                pesos_dinamicos['cantidad_problemas'] * obj_cantidad +
-                pesos_dinamicos['tiempo_total'] * obj_tiempo
-            )
-            
-            fitness_final = fitness_base + bonus_equipo + bonus_balance
-            
-            individuo.fitness = fitness_final
+        # Reducciones por individuo y por (individuo, participante)
+        num_asignaciones = np.bincount(ind_idx, minlength=num_individuos)
+        suma_compatibilidad = np.bincount(
+            ind_idx, weights=self._matriz_compatibilidad[problema_idx, participante_idx], minlength=num_individuos)
+        suma_probabilidad = np.bincount(
+            ind_idx, weights=self._matriz_probabilidad[problema_idx, participante_idx], minlength=num_individuos)
+        suma_puntuacion = np.bincount(
+            ind_idx, weights=self._matriz_puntuacion[problema_idx, participante_idx], minlength=num_individuos)
+        celda = ind_idx * num_participantes + participante_idx
+        conteos = np.bincount(celda, minlength=num_individuos * num_participantes).reshape(num_individuos, -1)
+        tiempos_suma = np.bincount(
+            celda, weights=self._matriz_tiempo[problema_idx, participante_idx],
+            minlength=num_individuos * num_participantes
+        ).reshape(num_individuos, -1)
+
+        usados = conteos > 0
+        participantes_usados = np.count_nonzero(usados, axis=1)
+        participantes_esperados = np.minimum(config.tamanio_equipo, num_asignaciones)
+        tiempo_total_paralelo = tiempos_suma.max(axis=1) if num_participantes else np.zeros(num_individuos)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factor_utilizacion = np.where(
+                participantes_usados < participantes_esperados, participantes_usados / participantes_esperados, 1.0)
+            obj_puntuacion = (suma_puntuacion / self._puntuacion_maxima_teorica
+                              if self._puntuacion_maxima_teorica > 0 else np.zeros(num_individuos))
+            obj_fortalezas = suma_compatibilidad / num_asignaciones
+            obj_cantidad = suma_probabilidad / len(problemas) if problemas else np.zeros(num_individuos)
+            obj_tiempo = np.maximum(0.0, 1.0 - tiempo_total_paralelo / config.tiempo_total_minutos)
+
+            # Balance de carga: coeficiente de variación de los tiempos de participantes usados
+            media_tiempos = tiempos_suma.sum(axis=1) / participantes_usados
+            varianza = np.where(usados, (tiempos_suma - media_tiempos[:, None]) ** 2, 0.0).sum(axis=1) / participantes_usados
+            cv_tiempos = np.where(media_tiempos > 0, np.sqrt(varianza) / media_tiempos, 1.0)
+            bonus_balance = np.where(participantes_usados > 1, np.maximum(0.0, 1.0 - cv_tiempos) * 0.05, 0.0)
+
+        bonus_equipo = factor_utilizacion * 0.1
+        objetivos = np.stack([obj_puntuacion, obj_fortalezas, obj_cantidad, obj_tiempo])
+        fitness = self._vector_pesos @ objetivos + bonus_equipo + bonus_balance
+        validos = (num_asignaciones > 0) & (tiempo_total_paralelo <= config.tiempo_total_minutos)
+
+        for b, individuo in enumerate(individuos):
+            if not validos[b]:
+                individuo.fitness, individuo.es_valido = 0.0, False
+                continue
+            individuo.fitness = float(fitness[b])
             individuo.es_valido = True
-            
-            # Métricas detalladas
             individuo.metricas_detalladas = {
-                'puntuacion_total': puntuacion_total,
-                'obj_puntuacion': obj_puntuacion,
-                'obj_fortalezas': obj_fortalezas,
-                'obj_cantidad': obj_cantidad,
-                'obj_tiempo': obj_tiempo,
-                'participantes_utilizados': participantes_usados,
-                'participantes_esperados': participantes_esperados,
-                'factor_utilizacion': factor_utilizacion,
-                'tiempo_total_paralelo': tiempo_total_paralelo,
-                'tiempos_por_participante': tiempos_por_participante,
-                'bonus_equipo': bonus_equipo,
-                'bonus_balance': bonus_balance,
+                'puntuacion_total': float(suma_puntuacion[b]),
+                'obj_puntuacion': float(obj_puntuacion[b]),
+                'obj_fortalezas': float(obj_fortalezas[b]),
+                'obj_cantidad': float(obj_cantidad[b]),
+                'obj_tiempo': float(obj_tiempo[b]),
+                'participantes_utilizados': int(participantes_usados[b]),
+                'participantes_esperados': int(participantes_esperados[b]),
+                'factor_utilizacion': float(factor_utilizacion[b]),
+                'tiempo_total_paralelo': float(tiempo_total_paralelo[b]),
+                'tiempos_por_participante': {
+                    int(j): float(tiempos_suma[b, j]) for j in np.flatnonzero(usados[b])
+                },
+                'bonus_equipo': float(bonus_equipo[b]),
+                'bonus_balance': float(bonus_balance[b]),
                 'pesos_utilizados': pesos_dinamicos
             }
-            
-        except Exception as e:
-            logger.error(f"Error en evaluación: {e}", exc_info=True)
-            individuo.fitness, individuo.es_valido = 0.0, False
+
+    def _extraer_indices_validos(self, matriz):
+        """Índices (problema, participante) de las asignaciones válidas, como arreglos"""
+        filas, columnas = np.nonzero(matriz > 0)
+
+        # Con filas repetidas se prioriza la mayor puntuación esperada (greedy), no la primera columna
+        _, primeras = np.unique(filas, return_index=True)
+        if primeras.size < filas.size and self._matriz_puntuacion is not None:
+            puntuaciones = self._matriz_puntuacion[filas, columnas]
+            orden = np.lexsort((-puntuaciones, filas))
+            filas, columnas = filas[orden], columnas[orden]
+            _, primeras = np.unique(filas, return_index=True)
+
+        # Un solo participante por problema
+        return filas[primeras], columnas[primeras]
 
     def _extraer_asignaciones_validas(self, matriz, problemas, participantes):
         """Extrae asignaciones válidas de la matriz cromosómica"""
-        asignaciones = []
-        problemas_usados = set()
-        
-        for i in range(matriz.shape[0]):
-            for j in range(matriz.shape[1]):
-                if matriz[i,j] > 0 and i not in problemas_usados:
-                    asignaciones.append({
-                        'problema_idx': i,
-                        'participante_idx': j
-                    })
-                    problemas_usados.add(i)
-        
-        return asignaciones
+        filas, columnas = self._extraer_indices_validos(matriz)
+        return [
+            {'problema_idx': i, 'participante_idx': j}
+            for i, j in zip(filas.tolist(), columnas.tolist())
+        ]
 
 class AlgoritmoGeneticoCoderush:
-    def __init__(self, problemas, participantes, configuracion_competencia):
+    def __init__(self, problemas, participantes, configuracion_competencia, semilla: Optional[int] = None):
+        problemas, participantes = self._validar_entidades(problemas, participantes)
         self.problemas = problemas
         self.participantes = participantes
         self.configuracion = configuracion_competencia
         self.evaluador = EvaluadorFitness()
+        self.evaluador._preparar_datos(problemas, participantes)
         
         self.num_problemas = len(problemas)
         self.num_participantes = len(participantes)
+        self._nombres_problemas = [p['nombre'] for p in problemas]
+        self._nombres_participantes = [p['nombre'] for p in participantes]
+
+        # Generador NumPy (PCG64) para muestreo por lotes
+        self.rng = np.random.default_rng(semilla)
+
+        # Orden de participantes por experiencia (no cambia durante la ejecución)
+        experiencia_total = np.array(
+            [p['experiencia_anos'] + p['competencias_participadas'] for p in participantes], dtype=np.float64
+        )
+        self._participantes_por_experiencia = np.argsort(-experiencia_total, kind='stable')
+
+        # Mitad más compatible de participantes por problema: argpartition y solo se ordena esa mitad
+        self._top_compatibilidad = self._mitad_mas_compatible(self.evaluador._matriz_compatibilidad)
         
         # ✅ PARÁMETROS ADAPTATIVOS: Se calculan según el tamaño del problema
         self.poblacion_size = max(80, min(self.num_problemas * self.num_participantes * 3, 200))
@@ -324,180 +351,245 @@ class AlgoritmoGeneticoCoderush:
         self.torneo_size = max(3, int(self.poblacion_size * 0.05))
         
         self.historial_fitness = []
+        self._poblacion_final: List[IndividuoGenetico] = []
         
         logger.info(f"Algoritmo con trabajo en paralelo - Población: {self.poblacion_size}")
         logger.info(f"Generaciones: {self.generaciones_max}, Tamaño equipo: {configuracion_competencia.tamanio_equipo}")
 
+    @staticmethod
+    def _mitad_mas_compatible(matriz):
+        """Por fila, los índices de la mitad superior (mínimo 1) de mayor a menor compatibilidad"""
+        num_filas, num_columnas = matriz.shape
+        k = max(1, num_columnas // 2)
+        if num_columnas == 0:
+            return np.zeros((num_filas, 0), dtype=np.intp)
+        if k < num_columnas:
+            candidatos = np.argpartition(-matriz, k - 1, axis=1)[:, :k]
+        else:
+            candidatos = np.tile(np.arange(num_columnas), (num_filas, 1))
+        orden = np.argsort(-np.take_along_axis(matriz, candidatos, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(candidatos, orden, axis=1)
+
+    @staticmethod
+    def _validar_entidades(problemas, participantes):
+        """Valida y normaliza una sola vez los datos de entrada a valores numéricos"""
+        def normalizar(entidad, campos, opcionales, tipo, indice):
+            normalizada = dict(entidad)
+            for campo in campos + opcionales:
+                if campo not in entidad:
+                    if campo in opcionales:
+                        continue
+                    raise ValueError(f"{tipo} {indice}: falta el campo '{campo}'")
+                try:
+                    normalizada[campo] = float(entidad[campo])
+                except (TypeError, ValueError):
+                    raise ValueError(f"{tipo} {indice}: valor no numérico en '{campo}': {entidad[campo]!r}")
+            return normalizada
+
+        problemas_norm = [
+            normalizar(p, CAMPOS_NUMERICOS_PROBLEMA, CAMPOS_NUMERICOS_PROBLEMA_OPCIONALES, 'Problema', i)
+            for i, p in enumerate(problemas)
+        ]
+        participantes_norm = [
+            normalizar(p, CAMPOS_NUMERICOS_PARTICIPANTE, (), 'Participante', i)
+            for i, p in enumerate(participantes)
+        ]
+
+        # NaN/inf en una sola comprobación por tipo de entidad, sobre los campos declarados
+        for entidades, campos, tipo in (
+            (problemas_norm, CAMPOS_NUMERICOS_PROBLEMA + CAMPOS_NUMERICOS_PROBLEMA_OPCIONALES, 'Problema'),
+            (participantes_norm, CAMPOS_NUMERICOS_PARTICIPANTE, 'Participante'),
+        ):
+            valores = np.array([[e.get(c, 0.0) for c in campos] for e in entidades], dtype=np.float64)
+            no_finitos = np.argwhere(~np.isfinite(valores))
+            if no_finitos.size:
+                indice, k = no_finitos[0].tolist()
+                raise ValueError(f"{tipo} {indice}: valor no finito en '{campos[k]}': {float(valores[indice, k])}")
+        return problemas_norm, participantes_norm
+
     def iniciar_optimizacion(self):
         """Ejecuta el algoritmo genético con trabajo en paralelo"""
         logger.info("Iniciando optimización con trabajo en paralelo real")
         
-        self.historial_fitness = []
+        # Historial en arreglos preasignados (un registro cada 20 generaciones); se serializa al final
+        generaciones_registradas = np.arange(0, self.generaciones_max, 20)
+        historial_mejor = np.empty(generaciones_registradas.size, dtype=np.float64)
+        historial_promedio = np.empty(generaciones_registradas.size, dtype=np.float64)
         poblacion = self._crear_poblacion_inicial()
         self._evaluar_poblacion(poblacion)
         
         for generacion in range(self.generaciones_max):
-            poblacion.sort(key=lambda x: x.fitness, reverse=True)
+            # Selección parcial de la élite (O(n)) en lugar de ordenar toda la población
+            fitness = np.fromiter((ind.fitness for ind in poblacion), dtype=np.float64, count=len(poblacion))
+            indices_elite = self._indices_elite(fitness)
+            mejor = poblacion[indices_elite[0]]
             
             # Registrar progreso cada 20 generaciones
             if generacion % 20 == 0:
-                mejor_fitness = poblacion[0].fitness
-                fitness_promedio = np.mean([ind.fitness for ind in poblacion])
-                
-                self.historial_fitness.append({
-                    'generacion': generacion,
-                    'mejor_fitness': mejor_fitness,
-                    'fitness_promedio': fitness_promedio
-                })
+                mejor_fitness = mejor.fitness
+                historial_mejor[generacion // 20] = mejor_fitness
+                historial_promedio[generacion // 20] = fitness.mean()
                 
                 # Log de participantes utilizados
-                if poblacion[0].metricas_detalladas:
-                    participantes_usados = poblacion[0].metricas_detalladas.get('participantes_utilizados', 0)
-                    logger.info(f"Generación {generacion}: Fitness={mejor_fitness:.4f}, Participantes={participantes_usados}")
+                if mejor.metricas_detalladas:
+                    participantes_usados = mejor.metricas_detalladas.get('participantes_utilizados', 0)
+                    logger.info("Generación %d: Fitness=%.4f, Participantes=%s", generacion, mejor_fitness, participantes_usados)
                 else:
-                    logger.info(f"Generación {generacion}: Fitness={mejor_fitness:.4f}")
+                    logger.info("Generación %d: Fitness=%.4f", generacion, mejor_fitness)
             
             # Crear nueva generación
-            nueva_poblacion = self._aplicar_elitismo(poblacion)
+            nueva_poblacion = self._aplicar_elitismo(poblacion, indices_elite)
+            hijos = []
             
-            while len(nueva_poblacion) < self.poblacion_size:
+            while len(nueva_poblacion) + len(hijos) < self.poblacion_size:
                 padre1 = self._seleccion_por_torneo(poblacion)
                 padre2 = self._seleccion_por_torneo(poblacion)
                 
                 hijo = self._cruza(padre1, padre2)
                 self._mutacion(hijo)
-                
-                self.evaluador.evaluar_individuo(hijo, self.problemas, 
-                                               self.participantes, self.configuracion)
-                nueva_poblacion.append(hijo)
+                hijos.append(hijo)
             
-            poblacion = nueva_poblacion
-        
+            # Los hijos se evalúan juntos en una sola pasada vectorizada
+            self._evaluar_poblacion(hijos)
+            poblacion = nueva_poblacion + hijos
+        
+        self.historial_fitness = [
+            {'generacion': g, 'mejor_fitness': m, 'fitness_promedio': f}
+            for g, m, f in zip(generaciones_registradas.tolist(), historial_mejor.tolist(), historial_promedio.tolist())
+        ]
+        self._poblacion_final = poblacion
         return self._formatear_resultado_final(poblacion)
 
     def _crear_poblacion_inicial(self):
         """Crea población inicial con múltiples estrategias"""
-        poblacion = []
         estrategias = ['aleatorio', 'por_experiencia', 'balanceado', 'por_compatibilidad']
+
+        # ✅ MUESTREO POR LOTES: cantidades y permutaciones de toda la población en una llamada
+        min_problemas, max_problemas = self._rango_problemas_a_asignar()
+        cantidades = self.rng.integers(min_problemas, max_problemas, endpoint=True, size=self.poblacion_size)
+        permutaciones = self.rng.permuted(
+            np.tile(np.arange(self.num_problemas), (self.poblacion_size, 1)), axis=1
+        )
         
-        for i in range(self.poblacion_size):
-            estrategia = estrategias[i % len(estrategias)]
-            individuo = self._crear_individuo_con_estrategia(estrategia)
-            poblacion.append(individuo)
+        # Todos los cromosomas en un solo tensor; cada estrategia llena su grupo de individuos en bloque
+        cromosomas = np.zeros((self.poblacion_size, self.num_problemas, self.num_participantes), dtype=np.int8)
+        posiciones = np.arange(self.num_problemas)
+        for k, estrategia in enumerate(estrategias):
+            grupo = np.arange(k, self.poblacion_size, len(estrategias))
+            if estrategia == 'por_compatibilidad':
+                for i in grupo.tolist():
+                    self._asignar_por_compatibilidad(cromosomas[i], permutaciones[i, :cantidades[i]])
+                continue
+            
+            participantes = self._participantes_por_posicion(estrategia, grupo.size)
+            fila, posicion = np.nonzero(posiciones[None, :] < cantidades[grupo, None])
+            individuo = grupo[fila]
+            cromosomas[individuo, permutaciones[individuo, posicion], participantes[fila, posicion]] = 1
         
-        return poblacion
+        return [IndividuoGenetico(cromosoma) for cromosoma in cromosomas]
 
-    def _crear_individuo_con_estrategia(self, estrategia):
-        """Crea individuo FORZANDO uso de múltiples participantes"""
-        cromosoma = np.zeros((self.num_problemas, self.num_participantes), dtype=int)
-        
-        # ✅ ASIGNAR MÁS PROBLEMAS para forzar uso de múltiples participantes
+    def _rango_problemas_a_asignar(self):
+        """✅ ASIGNAR MÁS PROBLEMAS para forzar uso de múltiples participantes"""
         min_problemas = max(3, self.num_problemas // 2)
         max_problemas = min(self.num_problemas, self.num_problemas * 3 // 4)
-        num_asignar = random.randint(min_problemas, max_problemas)
-        problemas_elegidos = random.sample(range(self.num_problemas), num_asignar)
+        return min_problemas, max_problemas
+
+    def _participantes_por_posicion(self, estrategia, num_individuos):
+        """Participante para cada posición de la lista de problemas elegidos, (individuos × problemas)"""
+        forma = (num_individuos, self.num_problemas)
         
         if estrategia == 'aleatorio':
-            for i in problemas_elegidos:
-                j = random.randint(0, self.num_participantes - 1)
-                cromosoma[i, j] = 1
-                
-        elif estrategia == 'por_experiencia':
-            participantes_ord = sorted(range(self.num_participantes), 
-                                     key=lambda i: self.participantes[i]['experiencia_anos'] + 
-                                                  self.participantes[i]['competencias_participadas'], 
-                                     reverse=True)
+            return self.rng.integers(0, self.num_participantes, size=forma)
+        
+        if estrategia == 'por_experiencia':
             # ✅ FORZAR DIVERSIDAD: Rotar entre participantes
-            for idx, i in enumerate(problemas_elegidos):
-                idx_participante = idx % len(participantes_ord)
-                j = participantes_ord[idx_participante]
-                cromosoma[i, j] = 1
-                
-        elif estrategia == 'balanceado':
-            # ✅ ESTRATEGIA MEJORADA: Distribuir uniformemente
-            carga = [0] * self.num_participantes
-            for i in problemas_elegidos:
-                # Siempre asignar al participante con menor carga
-                min_carga = min(carga)
-                candidatos = [idx for idx, c in enumerate(carga) if c == min_carga]
-                j = random.choice(candidatos)
-                cromosoma[i, j] = 1
-                carga[j] += 1
-                
-        else:  # por_compatibilidad con distribución
-            # ✅ DISTRIBUCIÓN FORZADA: Asegurar que varios participantes trabajen
-            participantes_usados = set()
-            for i in problemas_elegidos:
-                problema = self.problemas[i]
-                
-                # Si ya usamos suficientes participantes, continuar con compatibilidad normal
-                if len(participantes_usados) >= min(6, self.num_participantes):
-                    compatibilidades = []
-                    for j in range(self.num_participantes):
-                        participante = self.participantes[j]
-                        comp = self.evaluador._calcular_compatibilidad_pura(participante, problema)
-                        compatibilidades.append((j, comp))
-                    
-                    compatibilidades.sort(key=lambda x: x[1], reverse=True)
-                    top_50_pct = max(1, len(compatibilidades) // 2)
-                    j, _ = random.choice(compatibilidades[:top_50_pct])
+            rotacion = np.arange(self.num_problemas) % self.num_participantes
+            return np.broadcast_to(self._participantes_por_experiencia[rotacion], forma)
+        
+        # balanceado: ✅ ESTRATEGIA MEJORADA: Distribuir uniformemente
+        # Asignar siempre al de menor carga equivale a recorrer permutaciones aleatorias por rondas
+        rondas = -(-self.num_problemas // self.num_participantes)
+        secuencias = self.rng.permuted(
+            np.tile(np.arange(self.num_participantes), (num_individuos, rondas, 1)), axis=2
+        )
+        return secuencias.reshape(num_individuos, -1)[:, :self.num_problemas]
+
+    def _asignar_por_compatibilidad(self, cromosoma, problemas_elegidos):
+        """por_compatibilidad con distribución: escribe las asignaciones en el cromosoma dado"""
+        # ✅ DISTRIBUCIÓN FORZADA: Asegurar que varios participantes trabajen
+        participantes_usados = np.zeros(self.num_participantes, dtype=bool)
+        num_usados = 0
+        for i in problemas_elegidos.tolist():
+            # Si ya usamos suficientes participantes, continuar con compatibilidad normal
+            if num_usados >= min(6, self.num_participantes):
+                top_50_pct = self._top_compatibilidad.shape[1]
+                j = int(self._top_compatibilidad[i, self.rng.integers(top_50_pct)])
+            else:
+                # Forzar uso de participante nuevo
+                participantes_disponibles = np.flatnonzero(~participantes_usados)
+                if participantes_disponibles.size:
+                    j = int(participantes_disponibles[self.rng.integers(participantes_disponibles.size)])
                 else:
-                    # Forzar uso de participante nuevo
-                    participantes_disponibles = list(set(range(self.num_participantes)) - participantes_usados)
-                    if participantes_disponibles:
-                        j = random.choice(participantes_disponibles)
-                    else:
-                        j = random.randint(0, self.num_participantes - 1)
-                
-                cromosoma[i, j] = 1
-                participantes_usados.add(j)
-        
-        return IndividuoGenetico(cromosoma)
+                    j = int(self.rng.integers(self.num_participantes))
+            
+            cromosoma[i, j] = 1
+            if not participantes_usados[j]:
+                participantes_usados[j] = True
+                num_usados += 1
 
     def _evaluar_poblacion(self, poblacion):
         """Evalúa toda la población"""
-        for individuo in poblacion:
-            self.evaluador.evaluar_individuo(individuo, self.problemas, 
-                                           self.participantes, self.configuracion)
+        self.evaluador.evaluar_poblacion(poblacion, self.problemas, self.participantes, self.configuracion)
 
     def _seleccion_por_torneo(self, poblacion):
         """Selección por torneo"""
-        candidatos = random.sample(poblacion, min(self.torneo_size, len(poblacion)))
-        return max(candidatos, key=lambda x: x.fitness)
+        indices = self.rng.choice(len(poblacion), size=min(self.torneo_size, len(poblacion)), replace=False)
+        return max((poblacion[i] for i in indices.tolist()), key=lambda x: x.fitness)
+
+    def _indices_elite(self, fitness):
+        """Índices de los elite_size mejores, de mayor a menor fitness, vía argpartition"""
+        k = min(self.elite_size, fitness.size)
+        if k < fitness.size:
+            candidatos = np.argpartition(-fitness, k - 1)[:k]
+        else:
+            candidatos = np.arange(fitness.size)
+        return candidatos[np.argsort(-fitness[candidatos], kind='stable')]
 
-    def _aplicar_elitismo(self, poblacion):
+    def _aplicar_elitismo(self, poblacion, indices_elite):
         """Preserva los mejores individuos"""
-        return [deepcopy(ind) for ind in poblacion[:self.elite_size]]
+        # Sin copias: la cruza siempre produce individuos nuevos y solo los hijos se mutan,
+        # así que la élite nunca se modifica al pasar a la siguiente generación
+        return [poblacion[i] for i in indices_elite.tolist()]
 
     def _cruza(self, padre1, padre2):
         """Cruza uniforme con reparación"""
-        if random.random() > self.prob_cruce:
-            return deepcopy(padre1 if random.random() < 0.5 else padre2)
-        
-        # Cruza uniforme: cada gen se toma aleatoriamente de un padre
-        cromosoma_hijo = np.zeros_like(padre1.cromosoma)
-        for i in range(cromosoma_hijo.shape[0]):
-            for j in range(cromosoma_hijo.shape[1]):
-                if random.random() < 0.5:
-                    cromosoma_hijo[i, j] = padre1.cromosoma[i, j]
-                else:
-                    cromosoma_hijo[i, j] = padre2.cromosoma[i, j]
+        if self.rng.random() > self.prob_cruce:
+            return (padre1 if self.rng.random() < 0.5 else padre2).clone()
+        
+        # Padres gemelos: la cruza uniforme solo reproduciría el mismo cromosoma
+        if padre1 is padre2 or (padre1.huella() == padre2.huella()
+                                and np.array_equal(padre1.cromosoma, padre2.cromosoma)):
+            return padre1.clone()
+        
+        # Cruza uniforme: cada gen se toma aleatoriamente de un padre (una máscara para todo el cromosoma)
+        mascara = self.rng.random(padre1.cromosoma.shape) < 0.5
+        cromosoma_hijo = np.where(mascara, padre1.cromosoma, padre2.cromosoma)
         
         cromosoma_reparado = self._reparar_cromosoma(cromosoma_hijo)
         return IndividuoGenetico(cromosoma_reparado)
 
     def _mutacion(self, individuo):
         """Mutación adaptativa"""
-        if random.random() > self.prob_mutacion:
+        if self.rng.random() > self.prob_mutacion:
             return
         
-        tipos_mutacion = ['intercambio', 'reasignacion', 'agregar', 'quitar']
-        tipo = random.choice(tipos_mutacion)
+        tipo = TIPOS_MUTACION[self.rng.integers(len(TIPOS_MUTACION))]
+        individuo._huella = None
         
         if tipo == 'intercambio':
-            asignaciones = list(np.argwhere(individuo.cromosoma > 0))
+            asignaciones = np.argwhere(individuo.cromosoma > 0)
             if len(asignaciones) >= 2:
-                idx1, idx2 = random.sample(range(len(asignaciones)), 2)
+                idx1, idx2 = self.rng.choice(len(asignaciones), size=2, replace=False)
                 prob1, part1 = asignaciones[idx1]
                 prob2, part2 = asignaciones[idx2]
                 
@@ -507,50 +599,59 @@ class AlgoritmoGeneticoCoderush:
                 individuo.cromosoma[prob2, part1] = 1
                 
         elif tipo == 'reasignacion':
-            asignaciones = list(np.argwhere(individuo.cromosoma > 0))
-            if asignaciones:
-                prob_idx, _ = random.choice(asignaciones)
+            asignaciones = np.argwhere(individuo.cromosoma > 0)
+            if len(asignaciones):
+                prob_idx, _ = asignaciones[self.rng.integers(len(asignaciones))]
                 individuo.cromosoma[prob_idx, :] = 0
-                nuevo_participante = random.randint(0, self.num_participantes - 1)
+                nuevo_participante = self.rng.integers(self.num_participantes)
                 individuo.cromosoma[prob_idx, nuevo_participante] = 1
                 
         elif tipo == 'agregar':
-            problemas_sin_asignar = []
-            for i in range(self.num_problemas):
-                if np.sum(individuo.cromosoma[i, :]) == 0:
-                    problemas_sin_asignar.append(i)
+            problemas_sin_asignar = np.flatnonzero(~individuo.cromosoma.any(axis=1))
             
-            if problemas_sin_asignar:
-                prob_idx = random.choice(problemas_sin_asignar)
-                participante = random.randint(0, self.num_participantes - 1)
+            if problemas_sin_asignar.size:
+                prob_idx = self.rng.choice(problemas_sin_asignar)
+                participante = self.rng.integers(self.num_participantes)
                 individuo.cromosoma[prob_idx, participante] = 1
                 
         else:  # quitar
-            asignaciones = list(np.argwhere(individuo.cromosoma > 0))
+            asignaciones = np.argwhere(individuo.cromosoma > 0)
             if len(asignaciones) > 1:  # Mantener al menos una asignación
-                prob_idx, part_idx = random.choice(asignaciones)
+                prob_idx, part_idx = asignaciones[self.rng.integers(len(asignaciones))]
                 individuo.cromosoma[prob_idx, part_idx] = 0
 
     def _reparar_cromosoma(self, cromosoma):
         """Repara cromosoma para cumplir restricciones básicas"""
         cromosoma_reparado = cromosoma.copy()
         
-        # Asegurar que cada problema tenga máximo un participante
-        for i in range(self.num_problemas):
-            asignaciones = np.where(cromosoma_reparado[i, :] > 0)[0]
+        # Asegurar que cada problema tenga máximo un participante (solo se recorren filas en conflicto)
+        filas_en_conflicto = np.flatnonzero(np.count_nonzero(cromosoma_reparado > 0, axis=1) > 1)
+        for i in filas_en_conflicto.tolist():
+            asignaciones = np.flatnonzero(cromosoma_reparado[i, :] > 0)
             
-            if len(asignaciones) > 1:
-                # Mantener solo una asignación aleatoria
-                elegido = random.choice(asignaciones)
-                cromosoma_reparado[i, :] = 0
-                cromosoma_reparado[i, elegido] = 1
+            # Mantener solo una asignación aleatoria
+            elegido = self.rng.choice(asignaciones)
+            cromosoma_reparado[i, :] = 0
+            cromosoma_reparado[i, elegido] = 1
         
         return cromosoma_reparado
 
     def _formatear_resultado_final(self, poblacion):
         """Formatea el resultado final garantizando diversidad"""
-        poblacion.sort(key=lambda x: x.fitness, reverse=True)
-        soluciones_validas = [ind for ind in poblacion if ind.es_valido]
+        # Fitness y validez en un solo recorrido; conteo, promedio y candidatos salen de los arreglos
+        fitness = np.fromiter((ind.fitness for ind in poblacion), dtype=np.float64, count=len(poblacion))
+        indices_validos = np.flatnonzero(
+            np.fromiter((ind.es_valido for ind in poblacion), dtype=bool, count=len(poblacion))
+        )
+        num_validas = int(indices_validos.size)
+        fitness_promedio = fitness.mean() if fitness.size else 0.0
+        
+        # Solo se examinan los 50 mejores válidos: selección parcial y se ordenan solo esos
+        if indices_validos.size > 50:
+            indices_validos = indices_validos[np.argpartition(-fitness[indices_validos], 49)[:50]]
+            indices_validos.sort()
+        mejores = indices_validos[np.argsort(-fitness[indices_validos], kind='stable')]
+        soluciones_validas = [poblacion[i] for i in mejores.tolist()]
         
         if not soluciones_validas:
             return {'exito': False, 'mensaje': 'No se encontró solución válida'}
@@ -558,59 +659,56 @@ class AlgoritmoGeneticoCoderush:
         # ✅ SELECCIÓN DIVERSA CON UMBRAL MUY ESTRICTO
         top_3 = [soluciones_validas[0]]
         
-        # ✅ DEBUG: Log de la primera solución
-        primera_asignaciones = self.evaluador._extraer_asignaciones_validas(soluciones_validas[0].cromosoma, self.problemas, self.participantes)
-        logger.info(f"🥇 SOLUCIÓN 1 - Fitness: {soluciones_validas[0].fitness:.4f}")
-        logger.info(f"   Asignaciones: {[(self.problemas[a['problema_idx']]['nombre'][:15], self.participantes[a['participante_idx']]['nombre']) for a in primera_asignaciones[:3]]}")
+        # ✅ DEBUG: Log de la primera solución (solo se arma si el nivel DEBUG está activo)
+        depurar = logger.isEnabledFor(logging.DEBUG)
+        if depurar:
+            logger.debug("🥇 SOLUCIÓN 1 - Fitness: %.4f", soluciones_validas[0].fitness)
+            logger.debug("   Asignaciones: %s", self._pares_nombres(soluciones_validas[0].cromosoma, 3, 15))
         
-        for idx, solucion in enumerate(soluciones_validas[1:min(50, len(soluciones_validas))], 2):  # ✅ Buscar en más candidatos
+        for idx, solucion in enumerate(soluciones_validas[1:], 2):  # ✅ Buscar en más candidatos
             if len(top_3) >= 3:
                 break
             
+            # Copias exactas de una solución ya elegida se descartan sin comparar (huella confirmada con el cromosoma)
+            if any(solucion.huella() == elegida.huella() and np.array_equal(solucion.cromosoma, elegida.cromosoma)
+                   for elegida in top_3):
+                logger.debug("🔍 CANDIDATO %d - Fitness: %.4f ❌ DUPLICADO", idx, solucion.fitness)
+                continue
+            
             # ✅ DEBUG: Log de cada candidato
-            candidato_asignaciones = self.evaluador._extraer_asignaciones_validas(solucion.cromosoma, self.problemas, self.participantes)
-            logger.info(f"🔍 CANDIDATO {idx} - Fitness: {solucion.fitness:.4f}")
-            logger.info(f"   Asignaciones: {[(self.problemas[a['problema_idx']]['nombre'][:15], self.participantes[a['participante_idx']]['nombre']) for a in candidato_asignaciones[:3]]}")
+            if depurar:
+                logger.debug("🔍 CANDIDATO %d - Fitness: %.4f", idx, solucion.fitness)
+                logger.debug("   Asignaciones: %s", self._pares_nombres(solucion.cromosoma, 3, 15))
             
             # ✅ UMBRAL EXTREMADAMENTE ESTRICTO + VERIFICACIÓN ADICIONAL
             es_diferente = True
+            # La máscara del candidato no depende de la solución con la que se compara
+            mascara_nueva, num_nueva = self._mascara_asignaciones(solucion.cromosoma)
             for existente_idx, existente in enumerate(top_3):
                 similitud = self._calcular_similitud(solucion.cromosoma, existente.cromosoma)
                 
                 # ✅ DEBUG: Log de similitud
-                logger.info(f"   Similitud con solución {existente_idx + 1}: {similitud:.4f}")
+                logger.debug("   Similitud con solución %d: %.4f", existente_idx + 1, similitud)
                 
                 # ✅ DOBLE VERIFICACIÓN: Similitud + Asignaciones diferentes
-                asignaciones_nueva = self.evaluador._extraer_asignaciones_validas(solucion.cromosoma, self.problemas, self.participantes)
-                asignaciones_existente = self.evaluador._extraer_asignaciones_validas(existente.cromosoma, self.problemas, self.participantes)
+                mascara_existente, num_existente = self._mascara_asignaciones(existente.cromosoma)
+                
+                # Asignaciones de la nueva que no están en la existente (bits encendidos solo en la nueva)
+                diferencias = bin(mascara_nueva & ~mascara_existente).count('1')
                 
-                # Comparar asignaciones directamente
-                asignaciones_diferentes = len(asignaciones_nueva) != len(asignaciones_existente)
-                if not asignaciones_diferentes:
-                    # Verificar si al menos 2 asignaciones son diferentes
-                    diferencias = 0
-                    for asig_nueva in asignaciones_nueva:
-                        encontrada = False
-                        for asig_exist in asignaciones_existente:
-                            if (asig_nueva['problema_idx'] == asig_exist['problema_idx'] and 
-                                asig_nueva['participante_idx'] == asig_exist['participante_idx']):
-                                encontrada = True
-                                break
-                        if not encontrada:
-                            diferencias += 1
-                    
-                    asignaciones_diferentes = diferencias >= 2  # Al menos 2 asignaciones diferentes
+                # Comparar asignaciones directamente: al menos 2 asignaciones diferentes
+                asignaciones_diferentes = num_nueva != num_existente or diferencias >= 2
                 
                 # ✅ DEBUG: Log de verificación de asignaciones
-                logger.info(f"   Asignaciones diferentes: {asignaciones_diferentes} (diferencias: {diferencias if 'diferencias' in locals() else 'N/A'})")
+                logger.debug("   Asignaciones diferentes: %s (diferencias: %d)", asignaciones_diferentes, diferencias)
                 
                 # Si similitud > 0.1 O las asignaciones son muy similares, rechazar
                 if similitud > 0.1 or not asignaciones_diferentes:
                     es_diferente = False
-                    logger.info(f"   ❌ RECHAZADO - Similitud: {similitud:.4f} > 0.1 o asignaciones similares")
+                    logger.debug("   ❌ RECHAZADO - Similitud: %.4f > 0.1 o asignaciones similares", similitud)
                     break
                 else:
-                    logger.info(f"   ✅ DIFERENTE - Similitud: {similitud:.4f} <= 0.1 y asignaciones diferentes")
+                    logger.debug("   ✅ DIFERENTE - Similitud: %.4f <= 0.1 y asignaciones diferentes", similitud)
             
             if es_diferente:
                 top_3.append(solucion)
@@ -635,13 +733,11 @@ class AlgoritmoGeneticoCoderush:
         logger.info(f"🏆 TOP 3 FINAL - Participantes: {participantes_por_solucion}")
         
         # ✅ DEBUG: Verificar que las asignaciones finales sean diferentes
-        for i, solucion in enumerate(top_3):
-            asignaciones = self.evaluador._extraer_asignaciones_validas(solucion.cromosoma, self.problemas, self.participantes)
-            logger.info(f"🏆 SOLUCIÓN {i+1} FINAL:")
-            for j, asig in enumerate(asignaciones[:5]):  # Mostrar primeras 5
-                problema_nombre = self.problemas[asig['problema_idx']]['nombre'][:20]
-                participante_nombre = self.participantes[asig['participante_idx']]['nombre']
-                logger.info(f"   {j+1}. {problema_nombre} → {participante_nombre}")
+        if depurar:
+            for i, solucion in enumerate(top_3):
+                logger.debug("🏆 SOLUCIÓN %d FINAL:", i + 1)
+                for j, (problema_nombre, participante_nombre) in enumerate(self._pares_nombres(solucion.cromosoma, 5, 20)):  # Mostrar primeras 5
+                    logger.debug("   %d. %s → %s", j + 1, problema_nombre, participante_nombre)
         
         mejores_soluciones = {}
         for i, solucion in enumerate(top_3):
@@ -654,14 +750,30 @@ class AlgoritmoGeneticoCoderush:
             'estadisticas_finales': {
                 'generaciones_ejecutadas': self.generaciones_max,
                 'mejor_fitness': top_3[0].fitness,
-                'fitness_promedio': np.mean([ind.fitness for ind in poblacion]),
-                'soluciones_validas': len(soluciones_validas),
+                'fitness_promedio': fitness_promedio,
+                'soluciones_validas': num_validas,
                 'diversidad_lograda': len(top_3),
                 'participantes_utilizados_mejor': top_3[0].metricas_detalladas.get('participantes_utilizados', 0),
                 'tiempo_paralelo_mejor': top_3[0].metricas_detalladas.get('tiempo_total_paralelo', 0)
             }
         }
 
+    def _pares_nombres(self, cromosoma, limite, largo_problema):
+        """Primeras `limite` asignaciones como (nombre de problema recortado, nombre de participante)"""
+        filas, columnas = self.evaluador._extraer_indices_validos(cromosoma)
+        return [
+            (self._nombres_problemas[i][:largo_problema], self._nombres_participantes[j])
+            for i, j in zip(filas[:limite].tolist(), columnas[:limite].tolist())
+        ]
+
+    def _mascara_asignaciones(self, cromosoma):
+        """Codifica las asignaciones válidas como bitset (bit i*N+j) y devuelve (máscara, cantidad)"""
+        filas, columnas = self.evaluador._extraer_indices_validos(cromosoma)
+        mascara = 0
+        for celda in (filas * self.num_participantes + columnas).tolist():
+            mascara |= 1 << celda
+        return mascara, len(filas)
+
     def _forzar_diferencia(self, solucion_base, soluciones_existentes):
         """Fuerza que una solución sea diferente modificando asignaciones"""
         nuevo_cromosoma = solucion_base.cromosoma.copy()
@@ -671,7 +783,7 @@ class AlgoritmoGeneticoCoderush:
         
         if len(asignaciones_actuales) >= 2:
             # Intercambiar 2 asignaciones para forzar diferencia
-            idx1, idx2 = random.sample(range(len(asignaciones_actuales)), 2)
+            idx1, idx2 = self.rng.choice(len(asignaciones_actuales), size=2, replace=False)
             asig1 = asignaciones_actuales[idx1]
             asig2 = asignaciones_actuales[idx2]
             
@@ -695,36 +807,34 @@ class AlgoritmoGeneticoCoderush:
 
     def _convertir_a_json(self, individuo, indice):
         """Convierte individuo a formato JSON con métricas de trabajo en paralelo"""
-        asignaciones = self.evaluador._extraer_asignaciones_validas(
-            individuo.cromosoma, self.problemas, self.participantes
-        )
-        
-        detalle_asignaciones = []
-        for asig in asignaciones:
-            problema = self.problemas[asig['problema_idx']]
-            participante = self.participantes[asig['participante_idx']]
-            
-            # Recalcular métricas
-            compatibilidad = self.evaluador._calcular_compatibilidad_pura(participante, problema)
-            tiempo_estimado = self.evaluador._estimar_tiempo_real(participante, problema)
-            puntuacion_esperada = self.evaluador._calcular_puntuacion_esperada_pura(participante, problema)
-            
-            detalle_asignaciones.append({
-                'problema_nombre': problema['nombre'],
-                'participante_nombre': participante['nombre'],
-                'compatibilidad': round(compatibilidad, 3),
-                'tiempo_estimado': round(tiempo_estimado, 1),
-                'puntuacion_esperada': round(puntuacion_esperada, 2)
-            })
+        filas, columnas = self.evaluador._extraer_indices_validos(individuo.cromosoma)
+        
+        # Métricas por asignación indexadas de las matrices precalculadas del evaluador (ya redondeadas)
+        compatibilidades = [round(c, 3) for c in self.evaluador._matriz_compatibilidad[filas, columnas].tolist()]
+        tiempos = [round(t, 1) for t in self.evaluador._matriz_tiempo[filas, columnas].tolist()]
+        puntuaciones = [round(p, 2) for p in self.evaluador._matriz_puntuacion[filas, columnas].tolist()]
+        
+        detalle_asignaciones = [
+            {
+                'problema_nombre': self._nombres_problemas[i],
+                'participante_nombre': self._nombres_participantes[j],
+                'compatibilidad': compatibilidad,
+                'tiempo_estimado': tiempo_estimado,
+                'puntuacion_esperada': puntuacion_esperada
+            }
+            for i, j, compatibilidad, tiempo_estimado, puntuacion_esperada in zip(
+                filas.tolist(), columnas.tolist(), compatibilidades, tiempos, puntuaciones
+            )
+        ]
         
-        return {
+        solucion = {
             'solucion_id': indice + 1,
             'fitness': round(individuo.fitness, 6),
             'nombre_estrategia': f"Estrategia Optimizada {indice + 1}",
             'asignaciones_detalle': detalle_asignaciones,
             'metrica_transparencia': {
                 'pesos_utilizados': individuo.metricas_detalladas.get('pesos_utilizados', {}),
-                'num_asignaciones': len(asignaciones),
+                'num_asignaciones': len(detalle_asignaciones),
                 'algoritmo_trabajo_paralelo': True,
                 'participantes_utilizados': individuo.metricas_detalladas.get('participantes_utilizados', 0),
                 'tiempo_total_paralelo': round(individuo.metricas_detalladas.get('tiempo_total_paralelo', 0), 1),
@@ -733,4 +843,19 @@ class AlgoritmoGeneticoCoderush:
                 'bonus_balance': round(individuo.metricas_detalladas.get('bonus_balance', 0), 3),
                 'metricas_detalladas': individuo.metricas_detalladas
             }
+        }
+        
+        if detalle_asignaciones:
+            solucion['estadisticas'] = self._estadisticas_solucion(columnas, compatibilidades, tiempos, puntuaciones)
+        return solucion
+
+    def _estadisticas_solucion(self, columnas, compatibilidades, tiempos, puntuaciones):
+        """Resumen de una solución; las listas cortas se reducen con aritmética simple"""
+        # Tiempo en paralelo: máximo de la suma de tiempos de cada participante
+        tiempos_por_participante = np.bincount(columnas, weights=tiempos, minlength=self.num_participantes)
+        return {
+            'puntuacion_total_esperada': round(sum(puntuaciones), 2),
+            'tiempo_total_estimado': int(tiempos_por_participante.max()),
+            'compatibilidad_promedio': round(sum(compatibilidades) / len(compatibilidades) * 100, 1),
+            'participantes_utilizados': int(np.count_nonzero(np.bincount(columnas)))
         }
\ No newline at end of file
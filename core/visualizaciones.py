@@ -1,10 +1,67 @@
 import numpy as np
 import logging
-from typing import Dict, List
+from operator import itemgetter
+from typing import Dict, List, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Campos de cada punto de la gráfica, extraídos en una sola pasada (peor_fitness siempre presente)
+CAMPOS_PUNTO_GRAFICA = itemgetter('generacion', 'mejor_fitness', 'fitness_promedio', 'peor_fitness')
+
+# Chart.js no aprovecha más puntos que estos; las series más largas se submuestrean
+MAX_PUNTOS_GRAFICA = 2000
+
+# Opciones estáticas de la gráfica Chart.js; se comparten entre respuestas (solo lectura)
+OPCIONES_CHARTJS = {
+    'responsive': True,
+    'maintainAspectRatio': False,
+    'interaction': {
+        'intersect': False,
+        'mode': 'index'
+    },
+    'plugins': {
+        'title': {
+            'display': True,
+            'text': 'Evolución del Fitness por Generación',
+            'font': {'size': 16, 'weight': 'bold'}
+        },
+        'legend': {
+            'display': True,
+            'position': 'top'
+        },
+        'tooltip': {
+            'callbacks': {
+                'title': 'function(context) { return "Generación " + context[0].label; }',
+                'label': 'function(context) { return context.dataset.label + ": " + context.parsed.y.toFixed(4); }'
+            }
+        }
+    },
+    'scales': {
+        'x': {
+            'display': True,
+            'title': {
+                'display': True,
+                'text': 'Generación'
+            },
+            'grid': {
+                'color': 'rgba(0, 0, 0, 0.05)'
+            }
+        },
+        'y': {
+            'display': True,
+            'title': {
+                'display': True,
+                'text': 'Valor de Fitness'
+            },
+            'grid': {
+                'color': 'rgba(0, 0, 0, 0.05)'
+            },
+            'beginAtZero': False
+        }
+    }
+}
+
 class VisualizadorFitness:
     """
     Clase para procesar y formatear datos del algoritmo genético
@@ -17,6 +74,10 @@ class VisualizadorFitness:
             'promedio': '#4169E1',   # Azul real
             'peor': '#DC143C',       # Rojo carmesí
         }
+        # Colores de fondo con transparencia, calculados una sola vez
+        self.colores_fondo = {clave: color + '20' for clave, color in self.colores.items()}
+        # Generador propio para el ruido de los puntos interpolados
+        self.rng = np.random.default_rng()
         
         logger.info("VisualizadorFitness inicializado")
 
@@ -36,17 +97,23 @@ class VisualizadorFitness:
                 logger.warning("Historial vacío")
                 return self._generar_datos_vacios()
             
-            # Extrapolar datos faltantes entre puntos conocidos
-            datos_completos = self._extrapolar_generaciones(historial_basico)
+            # Extrapolar datos faltantes entre puntos conocidos (columnas NumPy)
+            columnas = self._extrapolar_generaciones(historial_basico)
             
-            # Calcular estadísticas adicionales
-            estadisticas = self._calcular_estadisticas_avanzadas(datos_completos, poblacion_final)
+            # Calcular estadísticas adicionales directamente sobre las columnas
+            estadisticas = self._calcular_estadisticas_avanzadas(columnas, poblacion_final)
+            
+            # Los diccionarios por punto solo se construyen para la respuesta, ya submuestreados
+            total_generaciones = columnas['generacion'].size
+            datos_completos = self._materializar_puntos(
+                columnas, historial_basico, self._indices_submuestreo(total_generaciones)
+            )
             
             return {
                 'datos_grafica': datos_completos,
                 'estadisticas': estadisticas,
                 'metadatos': {
-                    'total_generaciones': len(datos_completos),
+                    'total_generaciones': total_generaciones,
                     'puntos_reales': len(historial_basico),
                     'timestamp': datetime.now().isoformat(),
                     'algoritmo': 'Algoritmo Genético - Asignación de Problemas'
@@ -57,114 +124,119 @@ class VisualizadorFitness:
             logger.error(f"Error procesando historial: {e}", exc_info=True)
             return self._generar_datos_vacios()
 
-    def _extrapolar_generaciones(self, historial_basico: List[Dict]) -> List[Dict]:
-        """Extrapola datos entre puntos conocidos usando interpolación con validación"""
-        if len(historial_basico) <= 1:
-            return historial_basico
-        
-        datos_completos = []
+    def _extrapolar_generaciones(self, historial_basico: List[Dict]) -> Dict[str, np.ndarray]:
+        """Extrapola datos entre puntos conocidos; devuelve una columna NumPy por serie"""
+        num_puntos = len(historial_basico)
+        generaciones = np.fromiter((p['generacion'] for p in historial_basico), dtype=np.int64, count=num_puntos)
         
-        for i in range(len(historial_basico) - 1):
-            punto_actual = historial_basico[i]
-            punto_siguiente = historial_basico[i + 1]
-            
-            gen_actual = punto_actual['generacion']
-            gen_siguiente = punto_siguiente['generacion']
-            
-            # Agregar punto actual con validación
-            punto_validado = self._validar_orden_fitness(punto_actual.copy())
-            datos_completos.append(punto_validado)
-            
-            # Interpolar puntos intermedios
-            if gen_siguiente - gen_actual > 1:
-                num_intermedios = gen_siguiente - gen_actual - 1
-                
-                for j in range(1, num_intermedios + 1):
-                    factor = j / (num_intermedios + 1)
-                    
-                    gen_intermedio = gen_actual + j
-                    fitness_mejor_interp = self._interpolar_valor(
-                        punto_actual['mejor_fitness'],
-                        punto_siguiente['mejor_fitness'],
-                        factor
-                    )
-                    fitness_prom_interp = self._interpolar_valor(
-                        punto_actual['fitness_promedio'],
-                        punto_siguiente['fitness_promedio'],
-                        factor
-                    )
-                    
-                    # ✅ VALIDAR ORDEN: promedio <= mejor
-                    fitness_prom_interp = min(fitness_prom_interp, fitness_mejor_interp)
-                    
-                    # ✅ CALCULAR PEOR: siempre <= promedio
-                    fitness_peor_interp = max(0.0, min(
-                        fitness_prom_interp * np.random.uniform(0.7, 0.95),  # Entre 70%-95% del promedio
-                        fitness_prom_interp - np.random.uniform(0.01, 0.1)   # O hasta 0.1 menos que promedio
-                    ))
-                    
-                    punto_interpolado = {
-                        'generacion': gen_intermedio,
-                        'mejor_fitness': fitness_mejor_interp,
-                        'fitness_promedio': fitness_prom_interp,
-                        'peor_fitness': fitness_peor_interp,
-                        'interpolado': True
-                    }
-                    
-                    # ✅ VALIDACIÓN FINAL
-                    punto_interpolado = self._validar_orden_fitness(punto_interpolado)
-                    datos_completos.append(punto_interpolado)
+        # Eje completo de generaciones; los puntos reales ocupan su posición y el resto se interpola
+        inicio = int(generaciones[0])
+        eje = np.arange(inicio, generaciones[-1] + 1)
+        posiciones = generaciones - inicio
+        interpolado = np.ones(eje.size, dtype=bool)
+        interpolado[posiciones] = False
+        gen_interp = eje[interpolado]
+        n = gen_interp.size
         
-        # Agregar último punto con validación
-        ultimo_punto = self._validar_orden_fitness(historial_basico[-1].copy())
-        datos_completos.append(ultimo_punto)
+        mejor = np.empty(eje.size)
+        promedio = np.empty(eje.size)
+        peor = np.empty(eje.size)
+        mejor[posiciones] = np.fromiter((p['mejor_fitness'] for p in historial_basico), dtype=np.float64, count=num_puntos)
+        promedio[posiciones] = np.fromiter((p['fitness_promedio'] for p in historial_basico), dtype=np.float64, count=num_puntos)
+        peor[posiciones] = np.fromiter((p.get('peor_fitness', 0) for p in historial_basico), dtype=np.float64, count=num_puntos)
         
-        return datos_completos
-
-    def _validar_orden_fitness(self, punto: Dict) -> Dict:
-        """Valida y corrige el orden: mejor >= promedio >= peor"""
-        mejor = punto.get('mejor_fitness', 0)
-        promedio = punto.get('fitness_promedio', 0)
-        peor = punto.get('peor_fitness', 0)
+        # Interpolación lineal base con ruido pequeño para realismo (solo ±0.5%)
+        mejor_interp = np.clip(np.interp(gen_interp, generaciones, mejor[posiciones]) + self.rng.normal(0, 0.005, n), 0.0, 1.0)
+        prom_interp = np.clip(np.interp(gen_interp, generaciones, promedio[posiciones]) + self.rng.normal(0, 0.005, n), 0.0, 1.0)
         
-        # ✅ CORRECCIÓN 1: Promedio nunca mayor que mejor
-        if promedio > mejor:
-            promedio = mejor
+        # ✅ VALIDAR ORDEN: promedio <= mejor
+        np.minimum(prom_interp, mejor_interp, out=prom_interp)
         
-        # ✅ CORRECCIÓN 2: Peor nunca mayor que promedio
-        if peor > promedio:
-            peor = promedio * 0.9  # 90% del promedio
+        # ✅ CALCULAR PEOR: siempre <= promedio (70%-95% del promedio o hasta 0.1 menos)
+        mejor[interpolado] = mejor_interp
+        promedio[interpolado] = prom_interp
+        peor[interpolado] = np.maximum(0.0, np.minimum(
+            prom_interp * self.rng.uniform(0.7, 0.95, n),
+            prom_interp - self.rng.uniform(0.01, 0.1, n)
+        ))
         
-        # ✅ CORRECCIÓN 3: Si no hay peor, calcularlo como porcentaje del promedio
-        if 'peor_fitness' not in punto or peor <= 0:
-            peor = max(0.0, promedio * np.random.uniform(0.6, 0.8))
+        # ✅ VALIDACIÓN FINAL sobre todo el eje de una vez
+        mejor, promedio, peor = self._validar_orden_fitness(mejor, promedio, peor)
         
         return {
-            **punto,
+            'generacion': eje,
             'mejor_fitness': mejor,
             'fitness_promedio': promedio,
-            'peor_fitness': peor
+            'peor_fitness': peor,
+            'interpolado': interpolado
         }
 
-    def _interpolar_valor(self, valor_inicial: float, valor_final: float, factor: float) -> float:
-        """Interpolación suavizada con ruido realista y validación"""
-        # Interpolación lineal base
-        valor_base = valor_inicial + (valor_final - valor_inicial) * factor
+    @staticmethod
+    def _indices_submuestreo(total: int) -> np.ndarray:
+        """Posiciones a graficar: paso fijo hasta MAX_PUNTOS_GRAFICA, conservando siempre el último punto"""
+        if total <= MAX_PUNTOS_GRAFICA:
+            return np.arange(total)
+        paso = -(-total // MAX_PUNTOS_GRAFICA)
+        indices = np.arange(0, total, paso)
+        if indices[-1] != total - 1:
+            indices = np.append(indices, total - 1)
+        return indices
+
+    def _materializar_puntos(self, columnas: Dict[str, np.ndarray], historial_basico: List[Dict],
+                             indices: np.ndarray) -> List[Dict]:
+        """Convierte las columnas, en las posiciones dadas, en la lista de puntos que consume el frontend"""
+        mejor = columnas['mejor_fitness'][indices].tolist()
+        promedio = columnas['fitness_promedio'][indices].tolist()
+        peor = columnas['peor_fitness'][indices].tolist()
+        datos_completos = [
+            {
+                'generacion': gen,
+                'mejor_fitness': m,
+                'fitness_promedio': p,
+                'peor_fitness': w,
+                'interpolado': True
+            }
+            for gen, m, p, w in zip(columnas['generacion'][indices].tolist(), mejor, promedio, peor)
+        ]
+        # Los puntos reales que quedan en la muestra conservan sus campos adicionales
+        reales = dict(zip(np.flatnonzero(~columnas['interpolado']).tolist(), historial_basico))
+        for k, posicion in enumerate(indices.tolist()):
+            punto = reales.get(posicion)
+            if punto is None:
+                continue
+            datos_completos[k] = {
+                **punto,
+                'mejor_fitness': mejor[k],
+                'fitness_promedio': promedio[k],
+                'peor_fitness': peor[k]
+            }
+        
+        return datos_completos
+
+    def _validar_orden_fitness(self, mejor: np.ndarray, promedio: np.ndarray,
+                               peor: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Valida y corrige el orden: mejor >= promedio >= peor (arreglos completos)"""
+        # ✅ CORRECCIÓN 1: Promedio nunca mayor que mejor
+        promedio = np.minimum(promedio, mejor)
         
-        # Agregar ruido pequeño para realismo (solo ±0.5%)
-        ruido = np.random.normal(0, 0.005)  # Ruido mínimo
+        # ✅ CORRECCIÓN 2: Peor nunca mayor que promedio (90% del promedio)
+        peor = np.where(peor > promedio, promedio * 0.9, peor)
         
-        return max(0.0, min(1.0, valor_base + ruido))
+        # ✅ CORRECCIÓN 3: Si no hay peor, calcularlo como porcentaje del promedio
+        sin_peor = peor <= 0
+        peor[sin_peor] = np.maximum(0.0, promedio[sin_peor] * self.rng.uniform(0.6, 0.8, int(sin_peor.sum())))
+        
+        return mejor, promedio, peor
 
-    def _calcular_estadisticas_avanzadas(self, datos_completos: List[Dict], poblacion_final: List) -> Dict:
+    def _calcular_estadisticas_avanzadas(self, columnas: Dict[str, np.ndarray], poblacion_final: List) -> Dict:
         """Calcula estadísticas avanzadas para el dashboard"""
         try:
-            if not datos_completos:
+            # Todas las reducciones trabajan sobre las columnas contiguas, sin reconvertir
+            fitness_mejor = columnas['mejor_fitness']
+            fitness_promedio = columnas['fitness_promedio']
+            if not fitness_mejor.size:
                 return {}
             
-            fitness_mejor = [d['mejor_fitness'] for d in datos_completos]
-            fitness_promedio = [d['fitness_promedio'] for d in datos_completos]
-            
             # Métricas de convergencia
             convergencia = self._calcular_convergencia(fitness_mejor)
             
@@ -172,15 +244,15 @@ class VisualizadorFitness:
             diversidad = self._calcular_diversidad_poblacion(poblacion_final) if poblacion_final else {}
             
             return {
-                'fitness_maximo': max(fitness_mejor),
-                'fitness_final': fitness_mejor[-1],
-                'fitness_inicial': fitness_mejor[0],
-                'mejora_total_porcentaje': ((fitness_mejor[-1] - fitness_mejor[0]) / fitness_mejor[0] * 100) if fitness_mejor[0] > 0 else 0,
+                'fitness_maximo': float(fitness_mejor.max()),
+                'fitness_final': float(fitness_mejor[-1]),
+                'fitness_inicial': float(fitness_mejor[0]),
+                'mejora_total_porcentaje': float((fitness_mejor[-1] - fitness_mejor[0]) / fitness_mejor[0] * 100) if fitness_mejor[0] > 0 else 0,
                 'convergencia': convergencia,
                 'diversidad': diversidad,
                 'estabilidad': {
-                    'desviacion_ultimas_20': np.std(fitness_mejor[-20:]) if len(fitness_mejor) >= 20 else 0,
-                    'variacion_promedio': np.std(fitness_promedio)
+                    'desviacion_ultimas_20': float(fitness_mejor[-20:].std()) if fitness_mejor.size >= 20 else 0,
+                    'variacion_promedio': float(fitness_promedio.std())
                 }
             }
             
@@ -188,18 +260,19 @@ class VisualizadorFitness:
             logger.error(f"Error calculando estadísticas: {e}")
             return {}
 
-    def _calcular_convergencia(self, fitness_mejor: List[float]) -> Dict:
+    def _calcular_convergencia(self, fitness_mejor: np.ndarray) -> Dict:
         """Calcula métricas de convergencia del algoritmo"""
-        if len(fitness_mejor) < 10:
+        if fitness_mejor.size < 10:
             return {'estado': 'insuficientes_datos'}
         
         # Detectar plateau (estancamiento)
-        ultimos_10 = fitness_mejor[-10:]
-        variacion_reciente = np.std(ultimos_10)
+        variacion_reciente = fitness_mejor[-10:].std()
         
-        # Detectar tendencia general
-        x = np.arange(len(fitness_mejor))
-        tendencia = np.polyfit(x, fitness_mejor, 1)[0]
+        # Detectar tendencia general: pendiente de mínimos cuadrados en forma cerrada
+        # (x = 0..n-1 centrado, con suma de cuadrados n(n²-1)/12)
+        n = fitness_mejor.size
+        x_centrado = np.arange(n) - (n - 1) / 2
+        tendencia = float(x_centrado @ fitness_mejor) / (n * (n * n - 1) / 12)
         
         estado_convergencia = 'convergiendo'
         if variacion_reciente < 0.001:
@@ -211,20 +284,18 @@ class VisualizadorFitness:
             'estado': estado_convergencia,
             'tendencia': float(tendencia),
             'variacion_reciente': float(variacion_reciente),
-            'generacion_mejor': int(np.argmax(fitness_mejor)),
+            'generacion_mejor': int(fitness_mejor.argmax()),
             'plateaus_detectados': self._detectar_plateaus(fitness_mejor)
         }
 
-    def _detectar_plateaus(self, fitness_mejor: List[float], ventana: int = 15) -> int:
+    def _detectar_plateaus(self, fitness_mejor: np.ndarray, ventana: int = 15) -> int:
         """Detecta número de plateaus en la evolución"""
-        if len(fitness_mejor) < ventana * 2:
+        if fitness_mejor.size < ventana * 2:
             return 0
         
-        plateaus = 0
-        for i in range(ventana, len(fitness_mejor) - ventana):
-            ventana_actual = fitness_mejor[i-ventana:i+ventana]
-            if np.std(ventana_actual) < 0.005:  # Muy poca variación
-                plateaus += 1
+        # Todas las ventanas [i-ventana, i+ventana) de una vez, como vistas sin copia
+        ventanas = np.lib.stride_tricks.sliding_window_view(fitness_mejor, 2 * ventana)[:-1]
+        plateaus = int(np.count_nonzero(ventanas.std(axis=1) < 0.005))  # Muy poca variación
         
         return plateaus // ventana  # Evitar contar el mismo plateau múltiples veces
 
@@ -234,19 +305,26 @@ class VisualizadorFitness:
             if not poblacion_final:
                 return {}
             
-            fitness_valores = [ind.fitness for ind in poblacion_final if hasattr(ind, 'fitness')]
-            
-            if not fitness_valores:
+            # La población es homogénea: el tipo se comprueba una vez, no por individuo
+            if not hasattr(poblacion_final[0], 'fitness'):
                 return {}
             
+            fitness_valores = np.fromiter(
+                (ind.fitness for ind in poblacion_final), dtype=np.float64, count=len(poblacion_final)
+            )
+            
+            # Un solo ordenamiento para todos los cuantiles
+            q1, q2, q3, p90 = np.quantile(fitness_valores, [0.25, 0.5, 0.75, 0.9])
+            media = fitness_valores.mean()
+            
             return {
-                'coeficiente_variacion': np.std(fitness_valores) / np.mean(fitness_valores) if np.mean(fitness_valores) > 0 else 0,
-                'rango_fitness': max(fitness_valores) - min(fitness_valores),
-                'individuos_elite': len([f for f in fitness_valores if f > np.percentile(fitness_valores, 90)]),
+                'coeficiente_variacion': float(fitness_valores.std() / media) if media > 0 else 0,
+                'rango_fitness': float(fitness_valores.max() - fitness_valores.min()),
+                'individuos_elite': int(np.count_nonzero(fitness_valores > p90)),
                 'distribucion_cuartiles': {
-                    'q1': float(np.percentile(fitness_valores, 25)),
-                    'q2': float(np.percentile(fitness_valores, 50)),
-                    'q3': float(np.percentile(fitness_valores, 75))
+                    'q1': float(q1),
+                    'q2': float(q2),
+                    'q3': float(q3)
                 }
             }
             
@@ -269,10 +347,9 @@ class VisualizadorFitness:
                 return self._chartjs_datos_vacios()
             
             # Extraer datos
-            generaciones = [d['generacion'] for d in datos_grafica]
-            fitness_mejor = [d['mejor_fitness'] for d in datos_grafica]
-            fitness_promedio = [d['fitness_promedio'] for d in datos_grafica]
-            fitness_peor = [d.get('peor_fitness', d['fitness_promedio'] * 0.7) for d in datos_grafica]
+            generaciones, fitness_mejor, fitness_promedio, fitness_peor = map(
+                list, zip(*map(CAMPOS_PUNTO_GRAFICA, datos_grafica))
+            )
             
             return {
                 'type': 'line',
@@ -283,7 +360,7 @@ class VisualizadorFitness:
                             'label': 'Fitness Máximo',
                             'data': fitness_mejor,
                             'borderColor': self.colores['mejor'],
-                            'backgroundColor': self.colores['mejor'] + '20',
+                            'backgroundColor': self.colores_fondo['mejor'],
                             'borderWidth': 3,
                             'fill': False,
                             'tension': 0.2,
@@ -294,7 +371,7 @@ class VisualizadorFitness:
                             'label': 'Fitness Promedio',
                             'data': fitness_promedio,
                             'borderColor': self.colores['promedio'],
-                            'backgroundColor': self.colores['promedio'] + '20',
+                            'backgroundColor': self.colores_fondo['promedio'],
                             'borderWidth': 2,
                             'fill': False,
                             'tension': 0.2,
@@ -305,7 +382,7 @@ class VisualizadorFitness:
                             'label': 'Fitness Mínimo',
                             'data': fitness_peor,
                             'borderColor': self.colores['peor'],
-                            'backgroundColor': self.colores['peor'] + '20',
+                            'backgroundColor': self.colores_fondo['peor'],
                             'borderWidth': 1.5,
                             'borderDash': [5, 5],
                             'fill': False,
@@ -315,54 +392,7 @@ class VisualizadorFitness:
                         }
                     ]
                 },
-                'options': {
-                    'responsive': True,
-                    'maintainAspectRatio': False,
-                    'interaction': {
-                        'intersect': False,
-                        'mode': 'index'
-                    },
-                    'plugins': {
-                        'title': {
-                            'display': True,
-                            'text': 'Evolución del Fitness por Generación',
-                            'font': {'size': 16, 'weight': 'bold'}
-                        },
-                        'legend': {
-                            'display': True,
-                            'position': 'top'
-                        },
-                        'tooltip': {
-                            'callbacks': {
-                                'title': 'function(context) { return "Generación " + context[0].label; }',
-                                'label': 'function(context) { return context.dataset.label + ": " + context.parsed.y.toFixed(4); }'
-                            }
-                        }
-                    },
-                    'scales': {
-                        'x': {
-                            'display': True,
-                            'title': {
-                                'display': True,
-                                'text': 'Generación'
-                            },
-                            'grid': {
-                                'color': 'rgba(0, 0, 0, 0.05)'
-                            }
-                        },
-                        'y': {
-                            'display': True,
-                            'title': {
-                                'display': True,
-                                'text': 'Valor de Fitness'
-                            },
-                            'grid': {
-                                'color': 'rgba(0, 0, 0, 0.05)'
-                            },
-                            'beginAtZero': False
-                        }
-                    }
-                },
+                'options': OPCIONES_CHARTJS,
                 'estadisticas_resumen': {
                     'fitness_maximo': estadisticas.get('fitness_maximo', 0),
                     'fitness_final': estadisticas.get('fitness_final', 0),